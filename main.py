@@ -18,8 +18,9 @@ python convert_csv.py
 
 Dependencies
 ------------
-* `pandas`
+* `pandas` / `numpy`
 * `nltk` (the first run will auto‑download VADER)
+* `numba` (optional – JIT-compiles the sentiment bucketing for very large score arrays)
 
 Install them with:
 
@@ -30,15 +31,26 @@ pip install pandas nltk
 
 import os
 import re
+import importlib.util
 import csv
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+import numpy as np
 import pandas as pd
 from nltk.sentiment import SentimentIntensityAnalyzer
 import nltk
 
+# Numba is optional and only imported once an array is big enough to use it,
+# so spawned workers bucketing a few dozen comments never pay for the import.
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
 # --------------------------------------------------------------------------- #
 # Configuration
 # --------------------------------------------------------------------------- #
@@ -72,29 +84,80 @@ QUESTION_MAP = {
 # Reverse lookup for fast mapping
 TEXT_TO_QNUM = {v.lower(): k for k, v in QUESTION_MAP.items()}
 
-# Sentiment buckets using VADER compound score
-def compound_to_bucket(score: float) -> str:
-    if score >= 0.75:
-        return "Highly Positive"
-    if score >= 0.50:
-        return "Positive"
-    if score >= 0.10:
-        return "Slightly Positive"
-    if score > -0.10:
-        return "Neutral"
-    if score > -0.50:
-        return "Slightly Negative"
-    if score > -0.75:
-        return "Negative"
-    return "Highly Negative"
-
-# Ensure VADER data present
-try:
-    nltk.data.find('sentiment/vader_lexicon.zip')
-except LookupError:
-    nltk.download('vader_lexicon')
-
-sia = SentimentIntensityAnalyzer()
+# Output columns, in order
+MAIN_COLUMNS = ["Course Title", "Term", "Year", "# of Possible Responses", "Avg (21)", "Avg (23)"]
+QUANT_COLUMNS = ["Course Title", "Term", "Year", "# of Possible Responses", "Question #", "Question Text", "N", "Avg", "SD"]
+QUAL_COLUMNS = ["Course Title", "Term", "Year", "Question Text", "Answer Text", "Sentiment"]
+
+# Sentiment buckets using VADER compound score.
+# Thresholds are inclusive on the positive side and exclusive on the negative
+# side (e.g. 0.10 is "Slightly Positive", -0.10 is "Slightly Negative").
+NEG_BINS = np.array([-0.75, -0.50, -0.10])
+POS_BINS = np.array([0.10, 0.50, 0.75])
+LABELS = np.array([
+    "Highly Negative", "Negative", "Slightly Negative", "Neutral",
+    "Slightly Positive", "Positive", "Highly Positive",
+])
+
+NJIT_MIN_SCORES = 10_000_000  # below this the ~0.3 s numba import costs more than it saves
+_jit_bucket_codes = None
+
+def _bucket_codes(scores, neg_bins, pos_bins, out):
+    # Same counts as the searchsorted path: bins strictly below s on the
+    # negative side, bins at or below s on the positive side.
+    for i in range(scores.size):
+        s = scores[i]
+        code = 0
+        for t in neg_bins:
+            if s > t:
+                code += 1
+        for t in pos_bins:
+            if s >= t:
+                code += 1
+        out[i] = code
+
+def compound_to_bucket(scores: np.ndarray) -> np.ndarray:
+    """Map an array of compound scores to their bucket labels in one vectorised pass."""
+    global _jit_bucket_codes
+    if HAVE_NUMBA and scores.size >= NJIT_MIN_SCORES:
+        if _jit_bucket_codes is None:
+            from numba import njit
+            _jit_bucket_codes = njit(cache=True)(_bucket_codes)
+        idx = np.empty(scores.size, dtype=np.int8)
+        _jit_bucket_codes(scores, NEG_BINS, POS_BINS, idx)
+    else:
+        idx = (np.searchsorted(NEG_BINS, scores, side='left')
+               + np.searchsorted(POS_BINS, scores, side='right'))
+    return LABELS[idx]
+
+# The analyzer is loaded once in the parent. Under fork the workers inherit
+# it; under spawn they rebuild it from the parent's attributes (handed over
+# through the executor initializer) instead of re-reading the VADER zip.
+sia = None
+
+def init_analyzer(state: Optional[Dict] = None) -> None:
+    """Load the analyzer once, rebuilding it from ``state`` when one is handed over."""
+    global sia
+    if sia is not None:
+        return
+    if state is not None:
+        # Bypass __init__ (which reloads the lexicon) and copy the attributes
+        # the parent's analyzer carries, whatever NLTK's layout is.
+        sia = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+        sia.__dict__.update(state)
+        return
+    # Ensure VADER data present
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download('vader_lexicon')
+    sia = SentimentIntensityAnalyzer()
+
+def analyzer_state() -> Dict:
+    """Attributes a worker needs to rebuild ``sia``; the raw lexicon text is left out."""
+    # ``lexicon_file`` is the whole VADER zip entry as a string (~434 KB) and is
+    # only read by __init__ to build ``lexicon``, so it is not worth pickling.
+    return {k: v for k, v in vars(sia).items() if k != 'lexicon_file'}
 
 # --------------------------------------------------------------------------- #
 # Helpers
@@ -107,12 +170,17 @@ def parse_metadata(lines: List[str]) -> Dict[str, str]:
     """Extract term, year, course title, possible respondent count."""
     term, year, course_title, possible_resp = None, None, None, None
     for l in lines[:4]:
-        m_meta = meta_re.search(l)
-        if m_meta:
-            term, year, course_title = m_meta.group(1).title(), int(m_meta.group(2)), m_meta.group(3).strip()
-        m_resp = possible_resp_re.search(l)
-        if m_resp:
-            possible_resp = int(m_resp.group(1))
+        if term is None:
+            m_meta = meta_re.search(l)
+            if m_meta:
+                term, year, course_title = m_meta.group(1).title(), int(m_meta.group(2)), m_meta.group(3).strip()
+                continue
+        if possible_resp is None:
+            m_resp = possible_resp_re.search(l)
+            if m_resp:
+                possible_resp = int(m_resp.group(1))
+        if term is not None and possible_resp is not None:
+            break
     if None in (term, year, course_title, possible_resp):
         raise ValueError("Could not parse metadata in file header.")
     return {
@@ -125,6 +193,10 @@ def parse_metadata(lines: List[str]) -> Dict[str, str]:
 def clean_cell(cell: str) -> str:
     return (cell or "").strip().replace('\u00a0', ' ')
 
+def clean_column(col: pd.Series) -> pd.Series:
+    """Strip whitespace and normalise non-breaking spaces across a whole column."""
+    return col.str.strip().str.replace('\u00a0', ' ', regex=False)
+
 # --------------------------------------------------------------------------- #
 # Core parsing functions
 # --------------------------------------------------------------------------- #
@@ -132,62 +204,66 @@ def clean_cell(cell: str) -> str:
 def parse_quant_section(rows: List[List[str]], meta: Dict[str, str]) -> List[Dict]:
     quant_rows = []
     for row in rows:
-        if not row or row[0].startswith('Text Responses'):
+        if not row:
             break
         # Skip formatting rows that have empty Question Text
         if len(row) < 5:
             continue
-        q_text = clean_cell(row[1])
+        q_text, n, avg, sd = (clean_cell(row[i]) for i in (1, 2, 3, 4))
         if not q_text:
             continue
-        N   = int(float(clean_cell(row[2]))) if clean_cell(row[2]).isdigit() else None
-        avg = float(clean_cell(row[3])) if clean_cell(row[3]) else None
-        sd  = float(clean_cell(row[4])) if clean_cell(row[4]) else None
-        q_num = TEXT_TO_QNUM.get(q_text.lower())
         quant_rows.append({
             **meta,
-            "Question #": q_num,
+            "Question #": TEXT_TO_QNUM.get(q_text.lower()),
             "Question Text": q_text,
-            "N": N,
-            "Avg": avg,
-            "SD": sd,
+            "N": int(n) if n.isdigit() else None,
+            "Avg": float(avg) if avg else None,
+            "SD": float(sd) if sd else None,
         })
     return quant_rows
 
-def parse_qual_section(rows: List[List[str]], meta: Dict[str, str]) -> List[Dict]:
+def parse_qual_section(cells: pd.Series, meta: Dict[str, str]) -> List[List]:
+    """Qual rows in QUAL_COLUMNS order, without the trailing Sentiment."""
+    course = [meta[k] for k in ('Course Title', 'Term', 'Year')]
     qual_rows = []
     current_question = None
-    for row in rows:
-        if not row:
-            continue
-        cell = clean_cell(row[0])
+    for cell in clean_column(cells):
         if not cell:
             continue
-        if cell.lower().startswith('question:'):
-            current_question = re.sub(r'^Question:\s*', '', cell, flags=re.I).strip(': ').strip()
+        cell_lower = cell.lower()
+        if cell_lower.startswith('question:'):
+            current_question = cell[len('question:'):].lstrip().strip(': ').strip()
             continue
         if current_question is None:
             # Haven't encountered a question yet
             continue
-        if cell.lower() in ('n/a', 'na'):
+        if cell_lower in ('n/a', 'na'):
             continue  # ignore placeholder
-        sentiment = compound_to_bucket(sia.polarity_scores(cell)['compound'])
-        qual_rows.append({
-            **{k: meta[k] for k in ('Course Title', 'Term', 'Year')},
-            "Question Text": current_question,
-            "Answer Text": cell,
-            "Sentiment": sentiment,
-        })
+        qual_rows.append([*course, current_question, cell])
     return qual_rows
 
+@lru_cache(maxsize=65536)
+def _compound(text: str) -> float:
+    """VADER compound score, memoised per process so answers repeated across files are scored once."""
+    return sia.polarity_scores(text)['compound']
+
+def score_sentiment(texts: List[str]) -> np.ndarray:
+    """Score every distinct comment with VADER and bucket the results."""
+    init_analyzer()
+    # Repeated answers ("N/A", "None", "Great class") are scored once and broadcast back
+    codes, unique_texts = pd.factorize(pd.Series(texts, dtype=object))
+    scores = np.fromiter((_compound(t) for t in unique_texts), dtype=float, count=len(unique_texts))
+    return compound_to_bucket(scores[codes])
+
 def parse_main_record(quant_rows: List[Dict], meta: Dict[str, str]) -> Dict:
-    # Look for the two key averages
-    avg_21 = next((r['Avg'] for r in quant_rows if r.get('Question #') == 21), None)
-    avg_23 = next((r['Avg'] for r in quant_rows if r.get('Question #') == 23), None)
+    # Index averages by Question # once (first occurrence wins), then look up the two key ones
+    avg_by_q = {}
+    for r in quant_rows:
+        avg_by_q.setdefault(r['Question #'], r['Avg'])
     return {
         **meta,
-        "Avg (21)": avg_21,
-        "Avg (23)": avg_23,
+        "Avg (21)": avg_by_q.get(21),
+        "Avg (23)": avg_by_q.get(23),
     }
 
 # --------------------------------------------------------------------------- #
@@ -196,47 +272,87 @@ def parse_main_record(quant_rows: List[Dict], meta: Dict[str, str]) -> Dict:
 
 def process_file(path: Path):
     with path.open('r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        rows = list(reader)
-
-    raw_lines = [','.join(r) for r in rows]  # for meta parsing, join back
-    meta = parse_metadata(raw_lines)
+        # Metadata lives in the first cell of each of the four header rows
+        header_lines = [r[0] if r else '' for r in csv.reader(islice(f, 4))]
+        meta = parse_metadata(header_lines)
 
-    # Rows after header (row index 4 onward)
-    quant_section = rows[5:]  # skip first five rows incl. quant header
-    # find index where Text Responses starts
-    text_resp_idx = next((i for i, r in enumerate(quant_section) if r and r[0].startswith('Text Responses')), len(quant_section))
-    quant_rows = parse_quant_section(quant_section[:text_resp_idx], meta)
-    qual_rows  = parse_qual_section(quant_section[text_resp_idx:], meta)
+        # The quant block is a couple of dozen short rows: walk it with csv up
+        # to the Text Responses marker, skipping the quant header row
+        reader = csv.reader(f)
+        next(reader, None)
+        quant_section = []
+        for row in reader:
+            if row and row[0].startswith('Text Responses'):
+                break
+            quant_section.append(row)
+
+        # Continue from the same handle and let the C engine parse the text
+        # responses. Only the first column is used, so the remaining cells are
+        # never materialised, and rows with fewer or more trailing cells are
+        # accepted.
+        try:
+            qual_cells = pd.read_csv(f, engine='c', header=None, usecols=[0], dtype=str,
+                                     na_filter=False, keep_default_na=False)[0]
+        except pd.errors.EmptyDataError:
+            # No text responses (or no body at all after the header)
+            qual_cells = pd.Series([], dtype=object)
+
+    quant_rows = parse_quant_section(quant_section, meta)
+    qual_rows  = parse_qual_section(qual_cells, meta)
+    sentiments = score_sentiment([r[-1] for r in qual_rows]).tolist()
+    for r, sentiment in zip(qual_rows, sentiments):
+        r.append(sentiment)
     main_row   = parse_main_record(quant_rows, meta)
 
     return main_row, quant_rows, qual_rows
 
 def main():
-    main_records: List[Dict]  = []
-    quant_records: List[Dict] = []
-    qual_records: List[Dict]  = []
-
-    for csv_file in INPUT_DIR.glob('*.csv'):
-        try:
-            m, q_rows, ql_rows = process_file(csv_file)
-        except Exception as exc:
-            print(f"Error processing {csv_file.name}: {exc}", file=sys.stderr)
-            continue
-        main_records.append(m)
-        quant_records.extend(q_rows)
-        qual_records.extend(ql_rows)
-
-    # Create DataFrames with explicit column order
-    main_df  = pd.DataFrame(main_records, columns=["Course Title", "Term", "Year", "# of Possible Responses", "Avg (21)", "Avg (23)"])
-    quant_df = pd.DataFrame(quant_records, columns=["Course Title", "Term", "Year", "# of Possible Responses", "Question #", "Question Text", "N", "Avg", "SD"])
-    qual_df  = pd.DataFrame(qual_records, columns=["Course Title", "Term", "Year", "Question Text", "Answer Text", "Sentiment"])
-
-    main_df.to_csv(OUTPUT_DIR / 'Main.csv',  index=False)
-    quant_df.to_csv(OUTPUT_DIR / 'Quant.csv', index=False)
-    qual_df.to_csv(OUTPUT_DIR / 'Qual.csv',  index=False)
-
-    print(f"Wrote Main.csv ({len(main_df)}) Quant.csv ({len(quant_df)}) Qual.csv ({len(qual_df)}) to {OUTPUT_DIR}")
+    counts = {'Main.csv': 0, 'Quant.csv': 0, 'Qual.csv': 0}
+    outputs = {'Main.csv': MAIN_COLUMNS, 'Quant.csv': QUANT_COLUMNS, 'Qual.csv': QUAL_COLUMNS}
+
+    init_analyzer()
+
+    with ExitStack() as stack:
+        # Open the three outputs up front and write their headers once; each
+        # file's rows are then appended as soon as it is processed. Missing
+        # values are None, which csv writes as an empty field.
+        writers = {}
+        for name, columns in outputs.items():
+            f = stack.enter_context((OUTPUT_DIR / name).open('w', encoding='utf-8', newline=''))
+            writers[name] = csv.writer(f, lineterminator=os.linesep)
+            writers[name].writerow(columns)
+
+        # List the inputs before starting the pool; workers are only spawned
+        # on the first submit(), so there is nothing for the scan to overlap with.
+        with os.scandir(INPUT_DIR) as it:
+            csv_files = iter([Path(e.path) for e in it if e.name.endswith('.csv') and e.is_file()])
+
+        # Each file is independent, so parse and score them in parallel;
+        # results are written in submission order to keep the output
+        # deterministic and released as soon as they are written. Only a
+        # window of files is in flight at once, so a slow file at the head
+        # of the queue cannot let every later result pile up in memory.
+        ex = stack.enter_context(ProcessPoolExecutor(initializer=init_analyzer, initargs=(analyzer_state(),)))
+        window = 2 * (os.cpu_count() or 1)
+        futures = deque((csv_file, ex.submit(process_file, csv_file)) for csv_file in islice(csv_files, window))
+        while futures:
+            csv_file, future = futures.popleft()
+            next_file = next(csv_files, None)
+            if next_file is not None:
+                futures.append((next_file, ex.submit(process_file, next_file)))
+            try:
+                m, q_rows, ql_rows = future.result()
+            except Exception as exc:
+                print(f"Error processing {csv_file.name}: {exc}", file=sys.stderr)
+                continue
+            writers['Main.csv'].writerow([m[c] for c in MAIN_COLUMNS])
+            writers['Quant.csv'].writerows([r[c] for c in QUANT_COLUMNS] for r in q_rows)
+            writers['Qual.csv'].writerows(ql_rows)
+            counts['Main.csv'] += 1
+            counts['Quant.csv'] += len(q_rows)
+            counts['Qual.csv'] += len(ql_rows)
+
+    print(f"Wrote Main.csv ({counts['Main.csv']}) Quant.csv ({counts['Quant.csv']}) Qual.csv ({counts['Qual.csv']}) to {OUTPUT_DIR}")
 
 if __name__ == '__main__':
     main()
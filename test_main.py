@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+SAMPLE = main.INPUT_DIR / "Distribution-Maier-Torsten-IME-361-1-Undergraduate-LEC-2025-Spring.csv"
+
+
+def _write_variant(tmp_path: Path, transform) -> Path:
+    lines = SAMPLE.read_text(encoding='utf-8').splitlines(keepends=True)
+    path = tmp_path / SAMPLE.name
+    path.write_text(''.join(transform(lines)), encoding='utf-8')
+    return path
+
+
+def _text_responses_start(lines):
+    return next(i for i, l in enumerate(lines) if l.startswith('Text Responses'))
+
+
+def _assert_same_rows(actual, expected):
+    assert pd.DataFrame(actual).equals(pd.DataFrame(expected))
+
+
+def test_process_file_accepts_short_text_response_rows(tmp_path):
+    def strip_trailing_commas(lines):
+        start = _text_responses_start(lines)
+        return lines[:start] + [l.rstrip('\n').rstrip(',') + '\n' for l in lines[start:]]
+
+    _, expected_quant, expected_qual = main.process_file(SAMPLE)
+    _, quant, qual = main.process_file(_write_variant(tmp_path, strip_trailing_commas))
+    _assert_same_rows(quant, expected_quant)
+    _assert_same_rows(qual, expected_qual)
+
+
+def test_process_file_accepts_comment_row_with_extra_cell(tmp_path):
+    def add_trailing_comma(lines):
+        i = len(lines) - 1  # last comment row
+        return lines[:i] + [lines[i].rstrip('\n') + ',\n'] + lines[i + 1:]
+
+    _, expected_quant, expected_qual = main.process_file(SAMPLE)
+    _, quant, qual = main.process_file(_write_variant(tmp_path, add_trailing_comma))
+    _assert_same_rows(quant, expected_quant)
+    _assert_same_rows(qual, expected_qual)
+
+
+def test_init_analyzer_rebuilds_from_parent_state(monkeypatch):
+    # Spawned workers get the parent's analyzer state instead of reloading the lexicon
+    main.init_analyzer()
+    parent = main.sia
+    state = main.analyzer_state()
+    monkeypatch.setattr(main, 'sia', None)
+    assert 'lexicon_file' not in state
+    main.init_analyzer(state)
+    assert main.sia is not parent
+    assert vars(main.sia).keys() == state.keys()
+    text = "Loved the class and the professor."
+    assert main.sia.polarity_scores(text) == parent.polarity_scores(text)
+
+
+def test_process_file_keeps_main_row_for_empty_body(tmp_path):
+    def header_only(lines):
+        return lines[:5]  # metadata rows plus the quant header
+
+    m, quant, qual = main.process_file(_write_variant(tmp_path, header_only))
+    assert m["Course Title"] == "IME 361 Lean Work Design"
+    assert m["Avg (21)"] is None and m["Avg (23)"] is None
+    assert len(quant) == 0
+    assert len(qual) == 0
+
+
+def test_process_file_skips_quant_rows_with_fewer_than_five_cells(tmp_path):
+    def add_short_row(lines):
+        return lines[:5] + [',Instructor conduct professional,4\n'] + lines[5:]
+
+    _, expected_quant, _ = main.process_file(SAMPLE)
+    _, quant, _ = main.process_file(_write_variant(tmp_path, add_short_row))
+    _assert_same_rows(quant, expected_quant)
+
+
+def _ladder_bucket(s):
+    # The original per-comment ladder from before bucketing was vectorised.
+    if s >= 0.75:
+        return "Highly Positive"
+    if s >= 0.50:
+        return "Positive"
+    if s >= 0.10:
+        return "Slightly Positive"
+    if s > -0.10:
+        return "Neutral"
+    if s > -0.50:
+        return "Slightly Negative"
+    if s > -0.75:
+        return "Negative"
+    return "Highly Negative"
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_compound_to_bucket_matches_ladder_at_thresholds(monkeypatch, use_numba):
+    if use_numba:
+        pytest.importorskip("numba")
+        monkeypatch.setattr(main, "NJIT_MIN_SCORES", 0)
+    else:
+        monkeypatch.setattr(main, "HAVE_NUMBA", False)
+    edges = np.array([-0.75, -0.50, -0.10, 0.10, 0.50, 0.75])
+    scores = np.concatenate([edges, np.nextafter(edges, -1.0), np.nextafter(edges, 1.0), [-1.0, 0.0, 1.0]])
+
+    assert main.compound_to_bucket(scores).tolist() == [_ladder_bucket(s) for s in scores]